@@ -1,11 +1,16 @@
+import time
+_inicio_script = time.time()
+
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import streamlit as st
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import glob
+import numpy as np
 import os
 
+_fim_imports = time.time()
+
 # Configuração da página
 st.set_page_config(
     page_title="DataBus - Análise de Viagens", 
@@ -16,8 +21,74 @@ st.set_page_config(
 
 # Configuração de estilo
 click_bus_palette = ["#6A0DAD", "#FFD700", "#9B30FF", "#FFDF00", "#4B0082", "#DAA520"]
-sns.set_palette(click_bus_palette)
-plt.style.use('default')
+
+# Arquivos de dados: padrão glob (ex.: "dados/**/*.csv.gz") via DATABUS_ARQUIVOS_CSV
+PADRAO_ARQUIVOS_CSV = os.environ.get("DATABUS_ARQUIVOS_CSV", "amostra_pequena.csv")
+MAX_THREADS_LEITURA = 4
+
+# Modo de medição de inicialização (DATABUS_MEDIR_INICIALIZACAO=1)
+MEDIR_INICIALIZACAO = os.environ.get("DATABUS_MEDIR_INICIALIZACAO", "0") == "1"
+tempos_execucao = {}
+
+def inicio_processo():
+    """Retorna o momento (epoch) em que o processo do servidor iniciou e a origem da medida
+    
+    Usa DATABUS_INICIO_PROCESSO definido pelo launcher
+    (ex.: DATABUS_INICIO_PROCESSO=$(date +%s.%N) streamlit run app.py) ou,
+    se disponível, o psutil; sem nenhum dos dois, usa o início do script
+    """
+    if os.environ.get("DATABUS_INICIO_PROCESSO"):
+        return float(os.environ["DATABUS_INICIO_PROCESSO"]), "launcher (DATABUS_INICIO_PROCESSO)"
+    try:
+        import psutil
+        return psutil.Process().create_time(), "psutil"
+    except ImportError:
+        return _inicio_script, "início do script (imports do servidor não incluídos)"
+
+@st.cache_resource(show_spinner=False)
+def tempos_partida_frio():
+    """Tempos da primeira execução do script neste processo, medidos desde o início do processo"""
+    inicio, origem = inicio_processo()
+    return {'inicio': inicio, 'origem': origem, 'etapas': {}, 'aberta': True}
+
+def registrar_tempo(etapa, momento=None):
+    """Registra o tempo até a etapa: desde o início do script e, na primeira execução, desde o início do processo"""
+    if not MEDIR_INICIALIZACAO:
+        return
+    
+    momento = momento or time.time()
+    tempos_execucao[etapa] = momento - _inicio_script
+    
+    partida_frio = tempos_partida_frio()
+    if partida_frio['aberta']:
+        partida_frio['etapas'][etapa] = momento - partida_frio['inicio']
+
+def mostrar_tempos_inicializacao():
+    """Exibe o relatório de tempos de inicialização quando o modo de medição está ativo"""
+    if not MEDIR_INICIALIZACAO:
+        return
+    
+    registrar_tempo("Execução completa do script")
+    
+    partida_frio = tempos_partida_frio()
+    partida_frio['aberta'] = False
+    
+    relatorio = pd.DataFrame({
+        'Etapa': list(tempos_execucao.keys()),
+        'Partida a frio (ms)': [
+            round(partida_frio['etapas'][etapa] * 1000, 1) if etapa in partida_frio['etapas'] else None
+            for etapa in tempos_execucao
+        ],
+        'Esta execução (ms)': [round(t * 1000, 1) for t in tempos_execucao.values()]
+    })
+    
+    with st.sidebar.expander("⏱️ Tempos de Inicialização", expanded=True):
+        st.dataframe(relatorio, use_container_width=True, hide_index=True)
+        st.caption(f"Partida a frio: primeira execução do processo, medida desde o início do processo "
+                   f"({partida_frio['origem']}). Esta execução: desde o início do script.")
+
+registrar_tempo("Início do script", _inicio_script)
+registrar_tempo("Imports do script", _fim_imports)
 
 # Estilos CSS personalizados
 st.markdown("""
@@ -45,30 +116,50 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def ler_csv(arquivo_csv, colunas_essenciais):
+    """Lê um CSV (ou .csv.gz) apenas com as colunas essenciais existentes"""
+    colunas_existentes = pd.read_csv(arquivo_csv, nrows=0).columns.tolist()
+    colunas_para_ler = [col for col in colunas_essenciais if col in colunas_existentes]
+    return pd.read_csv(arquivo_csv, usecols=colunas_para_ler)
+
+def versao_dados():
+    """Identifica a versão do conjunto de dados (arquivos, tamanhos e datas de modificação)"""
+    return tuple(
+        (f, os.path.getsize(f), os.path.getmtime(f))
+        for f in sorted(glob.glob(PADRAO_ARQUIVOS_CSV, recursive=True))
+        if f.endswith(('.csv', '.csv.gz'))
+    )
+
 @st.cache_data(show_spinner=False)
-def carregar_csv_completo():
-    """Carrega o arquivo CSV completo do repositório"""
+def carregar_csv_completo(versao):
+    """Carrega os arquivos CSV do repositório (um ou vários, via padrão glob)
+    
+    versao (ver versao_dados) faz parte da chave do cache: quando um arquivo
+    muda, os dados são recarregados junto com os agregados dos gráficos
+    """
     try:
-        # Alterado para amostra_pequena.csv
-        arquivo_csv = "amostra_pequena.csv"
+        arquivos_csv = sorted(
+            f for f in glob.glob(PADRAO_ARQUIVOS_CSV, recursive=True)
+            if f.endswith(('.csv', '.csv.gz'))
+        )
         
-        st.info(f"📁 Tentando carregar: {arquivo_csv}")
+        st.info(f"📁 Tentando carregar: {PADRAO_ARQUIVOS_CSV}")
         
-        # Verifica se o arquivo existe
-        if not os.path.exists(arquivo_csv):
-            st.warning(f"Arquivo '{arquivo_csv}' não encontrado no diretório.")
+        # Verifica se algum arquivo foi encontrado
+        if not arquivos_csv:
+            st.warning(f"Nenhum arquivo encontrado para '{PADRAO_ARQUIVOS_CSV}'.")
             
             # Lista arquivos disponíveis para debug
             st.write("📂 Arquivos no diretório:")
             for f in os.listdir('.'):
-                if f.endswith('.csv'):
+                if f.endswith(('.csv', '.csv.gz')):
                     size = os.path.getsize(f) / (1024*1024)
                     st.write(f"- {f}: {size:.1f} MB")
             
             return None
         
-        # Carrega o CSV completo
-        st.info("⏳ Carregando arquivo CSV...")
+        # Carrega os CSVs em paralelo (leitura e descompressão sobrepostas)
+        st.info(f"⏳ Carregando {len(arquivos_csv)} arquivo(s) CSV...")
         
         # Lê apenas as colunas essenciais para economizar memória
         colunas_essenciais = [
@@ -76,16 +167,26 @@ def carregar_csv_completo():
             'place_destination_departure', 'place_origin_return', 'fk_contact'
         ]
         
-        # Primeiro verifica quais colunas existem no arquivo
-        colunas_existentes = pd.read_csv(arquivo_csv, nrows=0).columns.tolist()
-        colunas_para_ler = [col for col in colunas_essenciais if col in colunas_existentes]
+        partes = []
+        progresso = st.progress(0.0)
+        with ThreadPoolExecutor(max_workers=MAX_THREADS_LEITURA) as executor:
+            leituras = [executor.submit(ler_csv, f, colunas_essenciais) for f in arquivos_csv]
+            # Resultados na ordem dos arquivos para que o DataFrame seja sempre o mesmo
+            for i, (arquivo_csv, futuro) in enumerate(zip(arquivos_csv, leituras), start=1):
+                try:
+                    partes.append(futuro.result())
+                except Exception as e:
+                    st.warning(f"⚠️ Arquivo ignorado ({arquivo_csv}): {str(e)}")
+                progresso.progress(i / len(arquivos_csv), text=f"{i}/{len(arquivos_csv)}: {os.path.basename(arquivo_csv)}")
+        
+        if not partes:
+            return None
         
-        st.write(f"📋 Colunas encontradas: {', '.join(colunas_para_ler)}")
+        df = pd.concat(partes, ignore_index=True) if len(partes) > 1 else partes[0]
         
-        # Lê o arquivo completo com as colunas selecionadas
-        df = pd.read_csv(arquivo_csv, usecols=colunas_para_ler)
+        st.write(f"📋 Colunas encontradas: {', '.join(df.columns)}")
         
-        st.success(f"✅ Arquivo carregado com sucesso! {len(df):,} registros")
+        st.success(f"✅ Arquivos carregados com sucesso! {len(df):,} registros")
         
         # PRÉ-PROCESSAMENTO
         st.info("🔍 Processando dados...")
@@ -149,128 +250,169 @@ def carregar_csv_completo():
         st.error(f"❌ Erro ao carregar arquivo CSV: {str(e)}")
         return None
 
-def gerar_grafico_media_mensal(df):
-    """Gera gráfico de média mensal"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+@st.cache_data(show_spinner=False)
+def preparar_dados_graficos(_df, versao, bins=30, top_n=10):
+    """Pré-agrega os dados dos gráficos uma vez por versão do conjunto de dados"""
+    df = _df
+    dados = {}
     
     if 'mes_ano' in df.columns and 'gmv_success' in df.columns:
-        media_mensal = df.groupby('mes_ano')['gmv_success'].mean()
-        
-        ax.plot(media_mensal.index.astype(str), media_mensal.values, 
-                marker='o', color=click_bus_palette[0], linewidth=3, markersize=6)
-        
-        media_geral = df['gmv_success'].mean()
-        ax.axhline(y=media_geral, color=click_bus_palette[1], linestyle='--', 
-                  linewidth=2, label=f'Média Geral: R$ {media_geral:.2f}')
-        
-        ax.set_title("Média de Valores por Mês", fontsize=16, fontweight='bold', pad=20)
-        ax.set_xlabel("Mês/Ano", fontsize=12)
-        ax.set_ylabel("Valor Médio (R$)", fontsize=12)
-        ax.tick_params(axis='x', rotation=45)
-        ax.grid(True, alpha=0.3)
-        ax.legend()
-    
-    plt.tight_layout()
-    return fig
-
-def gerar_grafico_destinos(df):
-    """Gera gráfico de top destinos"""
-    fig, ax = plt.subplots(figsize=(12, 8))
+        serie = df.groupby('mes_ano')['gmv_success'].agg(['mean', 'size'])
+        dados['serie_mensal'] = pd.DataFrame({
+            # Data ISO é lida como UTC pelo Vega-Lite: os gráficos usam utcyearmonth
+            'mes': serie.index.to_timestamp().strftime('%Y-%m-%d'),
+            'valor_medio': serie['mean'].round(2).values,
+            'viagens': serie['size'].values
+        })
     
-    if 'place_destination_departure' in df.columns:
-        top_destinos = df['place_destination_departure'].value_counts().head(10)
-        
-        ax.barh(range(len(top_destinos)), top_destinos.values, color=click_bus_palette[0], alpha=0.8)
-        ax.set_yticks(range(len(top_destinos)))
-        
-        # Truncar nomes muito longos
-        labels = [str(d)[:30] + '...' if len(str(d)) > 30 else str(d) for d in top_destinos.index]
-        ax.set_yticklabels(labels, fontsize=10)
+    if 'gmv_success' in df.columns and len(df) > 0:
+        valores = df['gmv_success'].to_numpy()
+        dados['media'] = float(valores.mean())
+        dados['mediana'] = float(np.median(valores))
         
-        for i, v in enumerate(top_destinos.values):
-            ax.text(v + max(top_destinos.values) * 0.01, i, f'{v:,}', 
-                    va='center', fontweight='bold', fontsize=9, color=click_bus_palette[4])
+        # Faixas fixas entre os percentis 1 e 99 (sem copiar o DataFrame)
+        q1, q99 = np.quantile(valores, [0.01, 0.99])
+        contagem, limites = np.histogram(valores, bins=bins, range=(q1, q99))
+        dados['histograma_linear'] = pd.DataFrame({
+            'inicio': limites[:-1], 'fim': limites[1:], 'viagens': contagem
+        })
         
-        ax.set_title("Top 10 Destinos Mais Comuns", fontsize=16, fontweight='bold', pad=20)
-        ax.set_xlabel("Número de Viagens", fontsize=12)
-        ax.grid(True, alpha=0.3, axis='x')
+        # Faixas em escala logarítmica, cobrindo toda a cauda de valores positivos
+        positivos = valores[valores > 0]
+        if len(positivos) > 0 and positivos.min() < positivos.max():
+            limites_log = np.geomspace(positivos.min(), positivos.max(), bins + 1)
+            contagem_log, _ = np.histogram(positivos, bins=limites_log)
+            dados['histograma_log'] = pd.DataFrame({
+                'inicio': limites_log[:-1], 'fim': limites_log[1:], 'viagens': contagem_log
+            })
     
-    plt.tight_layout()
-    return fig
-
-def gerar_grafico_distribuicao(df):
-    """Gera gráfico de distribuição de valores"""
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
-    if 'gmv_success' in df.columns:
-        # Usar percentis para visualização melhor
-        Q1 = df['gmv_success'].quantile(0.01)
-        Q3 = df['gmv_success'].quantile(0.99)
-        df_filtrado = df[(df['gmv_success'] >= Q1) & (df['gmv_success'] <= Q3)]
-        
-        ax.hist(df_filtrado['gmv_success'], bins=30, alpha=0.7, 
-               color=click_bus_palette[0], edgecolor='white')
-        
-        media = df['gmv_success'].mean()
-        mediana = df['gmv_success'].median()
-        ax.axvline(media, color=click_bus_palette[1], linestyle='--', linewidth=2,
-                  label=f'Média: R$ {media:.2f}')
-        ax.axvline(mediana, color=click_bus_palette[2], linestyle='--', linewidth=2,
-                  label=f'Mediana: R$ {mediana:.2f}')
-        
-        ax.set_title("Distribuição de Valores das Passagens", fontsize=16, fontweight='bold', pad=20)
-        ax.set_xlabel("Valor (R$)", fontsize=12)
-        ax.set_ylabel("Frequência", fontsize=12)
-        ax.grid(True, alpha=0.3)
-        ax.legend()
-    
-    plt.tight_layout()
-    return fig
-
-def gerar_grafico_retorno(df):
-    """Gera gráfico de proporção de retorno"""
-    fig, ax = plt.subplots(figsize=(10, 8))
+    if 'place_destination_departure' in df.columns:
+        top_destinos = df['place_destination_departure'].value_counts().head(top_n)
+        dados['top_destinos'] = pd.DataFrame({
+            'destino': top_destinos.index.astype(str), 'viagens': top_destinos.values
+        })
     
     if 'tem_retorno' in df.columns:
         contagem_retorno = df['tem_retorno'].value_counts()
-        
-        labels = ['Sem Retorno', 'Com Retorno']
-        cores = [click_bus_palette[0], click_bus_palette[1]]
-        
-        wedges, texts, autotexts = ax.pie(contagem_retorno.values, labels=labels, colors=cores,
-                                         autopct='%1.1f%%', startangle=90, textprops={'fontsize': 12})
-        
-        for text in texts:
-            text.set_fontweight('bold')
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
-        
-        ax.set_title("Proporção de Viagens com Retorno", fontsize=16, fontweight='bold', pad=20)
+        dados['retorno'] = pd.DataFrame({
+            'tipo': ['Com Retorno' if tem else 'Sem Retorno' for tem in contagem_retorno.index],
+            'viagens': contagem_retorno.values
+        })
     
-    plt.tight_layout()
-    return fig
+    return dados
 
-def gerar_grafico_sazonalidade(df):
-    """Gera gráfico de sazonalidade"""
-    fig, ax = plt.subplots(figsize=(14, 6))
-    
-    if 'mes_ano' in df.columns:
-        viagens_por_mes = df.groupby('mes_ano').size()
-        
-        ax.plot(viagens_por_mes.index.astype(str), viagens_por_mes.values,
-               marker='o', color=click_bus_palette[0], linewidth=2, markersize=6)
-        
-        ax.set_title("Sazonalidade - Número de Viagens por Mês", fontsize=16, fontweight='bold', pad=20)
-        ax.set_xlabel("Mês/Ano", fontsize=12)
-        ax.set_ylabel("Número de Viagens", fontsize=12)
-        ax.tick_params(axis='x', rotation=45)
-        ax.grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    return fig
+# Zoom/arraste nos eixos e tooltips são resolvidos no navegador (Vega-Lite)
+ZOOM_NAVEGADOR = [{"name": "zoom", "select": "interval", "bind": "scales"}]
+
+def grafico_media_mensal(dados):
+    """Gráfico interativo de média mensal"""
+    return {
+        "title": "Média de Valores por Mês",
+        "layer": [
+            {
+                "params": ZOOM_NAVEGADOR,
+                "mark": {"type": "line", "point": True, "color": click_bus_palette[0], "strokeWidth": 3},
+                "encoding": {
+                    "x": {"field": "mes", "type": "temporal", "timeUnit": "utcyearmonth", "title": "Mês/Ano",
+                          "scale": {"type": "utc"},
+                          "axis": {"format": "%m/%Y", "labelAngle": -45}},
+                    "y": {"field": "valor_medio", "type": "quantitative", "title": "Valor Médio (R$)"},
+                    "tooltip": [
+                        {"field": "mes", "type": "temporal", "timeUnit": "utcyearmonth", "title": "Mês/Ano", "format": "%m/%Y"},
+                        {"field": "valor_medio", "title": "Valor Médio (R$)", "format": ",.2f"},
+                        {"field": "viagens", "title": "Viagens", "format": ","}
+                    ]
+                }
+            },
+            {
+                "mark": {"type": "rule", "color": click_bus_palette[1], "strokeDash": [6, 4], "strokeWidth": 2},
+                "encoding": {"y": {"datum": dados['media']}},
+            }
+        ]
+    }
 
-def mostrar_analise(df):
+def grafico_destinos(dados):
+    """Gráfico interativo de top destinos"""
+    return {
+        "title": "Top 10 Destinos Mais Comuns",
+        "mark": {"type": "bar", "color": click_bus_palette[0], "opacity": 0.8},
+        "encoding": {
+            "y": {"field": "destino", "type": "nominal", "sort": "-x", "title": None,
+                  "axis": {"labelLimit": 250}},
+            "x": {"field": "viagens", "type": "quantitative", "title": "Número de Viagens"},
+            "tooltip": [
+                {"field": "destino", "title": "Destino"},
+                {"field": "viagens", "title": "Viagens", "format": ","}
+            ]
+        }
+    }
+
+def grafico_distribuicao(dados, escala_log=False):
+    """Gráfico interativo de distribuição de valores a partir das faixas pré-calculadas"""
+    return {
+        "title": "Distribuição de Valores das Passagens",
+        "layer": [
+            {
+                "params": ZOOM_NAVEGADOR,
+                "mark": {"type": "bar", "color": click_bus_palette[0], "opacity": 0.7,
+                         "stroke": "white"},
+                "encoding": {
+                    "x": {"field": "inicio", "type": "quantitative", "title": "Valor (R$)",
+                          "scale": {"type": "log" if escala_log else "linear"}},
+                    "x2": {"field": "fim"},
+                    "y": {"field": "viagens", "type": "quantitative", "title": "Frequência"},
+                    "tooltip": [
+                        {"field": "inicio", "title": "De (R$)", "format": ",.2f"},
+                        {"field": "fim", "title": "Até (R$)", "format": ",.2f"},
+                        {"field": "viagens", "title": "Viagens", "format": ","}
+                    ]
+                }
+            },
+            {
+                "mark": {"type": "rule", "color": click_bus_palette[1], "strokeDash": [6, 4], "strokeWidth": 2,
+                         "tooltip": f"Média: R$ {dados['media']:.2f}"},
+                "encoding": {"x": {"datum": dados['media']}}
+            },
+            {
+                "mark": {"type": "rule", "color": click_bus_palette[2], "strokeDash": [6, 4], "strokeWidth": 2,
+                         "tooltip": f"Mediana: R$ {dados['mediana']:.2f}"},
+                "encoding": {"x": {"datum": dados['mediana']}}
+            }
+        ]
+    }
+
+def grafico_retorno(dados):
+    """Gráfico interativo de proporção de retorno"""
+    return {
+        "title": "Proporção de Viagens com Retorno",
+        "mark": {"type": "arc", "tooltip": True},
+        "encoding": {
+            "theta": {"field": "viagens", "type": "quantitative"},
+            "color": {"field": "tipo", "type": "nominal", "title": None,
+                      "scale": {"domain": ["Sem Retorno", "Com Retorno"],
+                                "range": [click_bus_palette[0], click_bus_palette[1]]}}
+        }
+    }
+
+def grafico_sazonalidade(dados):
+    """Gráfico interativo de sazonalidade"""
+    return {
+        "title": "Sazonalidade - Número de Viagens por Mês",
+        "params": ZOOM_NAVEGADOR,
+        "mark": {"type": "line", "point": True, "color": click_bus_palette[0], "strokeWidth": 2},
+        "encoding": {
+            "x": {"field": "mes", "type": "temporal", "timeUnit": "utcyearmonth", "title": "Mês/Ano",
+                  "scale": {"type": "utc"},
+                  "axis": {"format": "%m/%Y", "labelAngle": -45}},
+            "y": {"field": "viagens", "type": "quantitative", "title": "Número de Viagens"},
+            "tooltip": [
+                {"field": "mes", "type": "temporal", "timeUnit": "utcyearmonth", "title": "Mês/Ano", "format": "%m/%Y"},
+                {"field": "viagens", "title": "Viagens", "format": ","}
+            ]
+        }
+    }
+
+def mostrar_analise(df, versao):
     """Mostra a análise dos dados"""
     st.success(f"✅ **Análise concluída!** {len(df):,} registros processados")
     
@@ -291,6 +433,8 @@ def mostrar_analise(df):
         perc_retorno = (df['tem_retorno'].sum() / len(df)) * 100
         st.markdown(f'<div class="metric-card">Viagens c/ Retorno<br><span style="font-size: 24px; font-weight: bold;">{perc_retorno:.1f}%</span></div>', unsafe_allow_html=True)
     
+    registrar_tempo("Primeira métrica na tela")
+    
     # Gráficos
     st.markdown("---")
     st.header("📈 Visualizações")
@@ -301,20 +445,35 @@ def mostrar_analise(df):
         "🔄 Viagens c/ Retorno", "📈 Sazonalidade"
     ])
     
+    # Apenas agregados (poucos KB) vão para o navegador
+    dados = preparar_dados_graficos(df, versao)
+    registrar_tempo("Dados dos gráficos prontos")
+    
     with tab1:
-        st.pyplot(gerar_grafico_media_mensal(df))
+        if 'serie_mensal' in dados:
+            st.vega_lite_chart(dados['serie_mensal'], grafico_media_mensal(dados), use_container_width=True)
     
     with tab2:
-        st.pyplot(gerar_grafico_destinos(df))
+        if 'top_destinos' in dados:
+            st.vega_lite_chart(dados['top_destinos'], grafico_destinos(dados), use_container_width=True)
     
     with tab3:
-        st.pyplot(gerar_grafico_distribuicao(df))
+        if 'histograma_linear' in dados:
+            escala = st.radio("Faixas de valores", ["Lineares (percentis 1-99)", "Logarítmicas"],
+                              horizontal=True, disabled='histograma_log' not in dados)
+            escala_log = escala == "Logarítmicas" and 'histograma_log' in dados
+            histograma = dados['histograma_log'] if escala_log else dados['histograma_linear']
+            st.vega_lite_chart(histograma, grafico_distribuicao(dados, escala_log), use_container_width=True)
     
     with tab4:
-        st.pyplot(gerar_grafico_retorno(df))
+        if 'retorno' in dados:
+            st.vega_lite_chart(dados['retorno'], grafico_retorno(dados), use_container_width=True)
     
     with tab5:
-        st.pyplot(gerar_grafico_sazonalidade(df))
+        if 'serie_mensal' in dados:
+            st.vega_lite_chart(dados['serie_mensal'], grafico_sazonalidade(dados), use_container_width=True)
+    
+    registrar_tempo("Gráficos enviados ao navegador")
     
     # Análises extras
     st.markdown("---")
@@ -348,18 +507,25 @@ def main():
     
     st.markdown(f'<div class="file-info">'
                f'🎯 <strong>MODO CSV COMPLETO</strong><br>'
-               f'📊 Analisando arquivo: amostra_pequena.csv<br>'
+               f'📊 Analisando arquivo(s): {PADRAO_ARQUIVOS_CSV}<br>'
                f'📈 Análise com amostra de dados - Sem necessidade de upload'
                f'</div>', unsafe_allow_html=True)
     
+    # Versão calculada uma vez por execução; invalida dados e gráficos juntos
+    versao = versao_dados()
+    
     # Adicionar spinner durante o carregamento
     with st.spinner('Carregando dados da amostra pequena...'):
-        df = carregar_csv_completo()
+        df = carregar_csv_completo(versao)
+    
+    registrar_tempo("Dados carregados")
     
     if df is not None:
-        mostrar_analise(df)
+        mostrar_analise(df, versao)
     else:
-        st.error("Não foi possível carregar os dados. Verifique se o arquivo 'amostra_pequena.csv' existe no diretório.")
+        st.error(f"Não foi possível carregar os dados. Verifique se existem arquivos para '{PADRAO_ARQUIVOS_CSV}' no diretório.")
+    
+    mostrar_tempos_inicializacao()
 
 # EXECUTAR A APLICAÇÃO
 if __name__ == "__main__":
@@ -1,11 +1,195 @@
 import pandas as pd
+import argparse
+import glob
+import gzip
+import hashlib
+import io
+import json
 import os
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import datetime
 
 
-def converter_csv_para_parquet(caminho_csv, caminho_parquet=None):
+# Colunas necessárias para a análise
+COLUNAS_ESSENCIAIS = [
+    'gmv_success',
+    'date_purchase',
+    'time_purchase',
+    'place_destination_departure',
+    'place_origin_return',
+    'fk_contact'
+]
+
+
+# Candidatos avaliados pelo auto-ajuste de layout do Parquet
+CODECS_CANDIDATOS = [
+    ('snappy', None),
+    ('zstd', 1),
+    ('zstd', 3),
+    ('zstd', 9),
+    ('lz4', None),
+]
+TAMANHOS_ROW_GROUP_CANDIDATOS = [50_000, 100_000, 250_000]
+ORDENACOES_CANDIDATAS = [
+    None,
+    ['date_purchase', 'time_purchase'],
+    ['place_destination_departure', 'date_purchase', 'time_purchase'],
+]
+
+# Pesos do score (menor é melhor): tamanho do arquivo, latência de leitura
+# do app e tempo de escrita, cada um relativo ao melhor candidato
+PESOS_AUTO_AJUSTE = {'tamanho': 1.0, 'leitura': 1.0, 'escrita': 0.5}
+
+CONFIGURACAO_PADRAO = {
+    'compression': 'snappy',
+    'compression_level': None,
+    'row_group_size': None,
+    'ordenacao': None,
+}
+
+
+def descrever_configuracao(config):
+    """
+    Descreve uma configuração de layout em uma linha legível
+    """
+    codec = config['compression']
+    if config['compression_level'] is not None:
+        codec = f"{codec}-{config['compression_level']}"
+    row_group = config['row_group_size'] or 'padrão'
+    ordenacao = ', '.join(config['ordenacao']) if config['ordenacao'] else 'sem ordenação'
+    return f"{codec} | row group: {row_group} | ordem: {ordenacao}"
+
+
+def escrever_parquet(df, caminho_parquet, config):
+    """
+    Escreve o DataFrame em Parquet aplicando a configuração de layout
+    """
+    if config['ordenacao']:
+        df = df.sort_values(config['ordenacao'], kind='stable', ignore_index=True)
+
+    opcoes = {'compression': config['compression']}
+    if config['compression_level'] is not None:
+        opcoes['compression_level'] = config['compression_level']
+    if config['row_group_size'] is not None:
+        opcoes['row_group_size'] = config['row_group_size']
+
+    # Sem índice: evita a coluna __index_level_0__ em índices não sequenciais
+    df.to_parquet(caminho_parquet, engine='pyarrow', index=False, **opcoes)
+
+
+def filtro_leitura_app(df):
+    """
+    Monta o filtro de data equivalente à leitura do app (últimos 15 meses)
+    """
+    if 'date_purchase' not in df.columns:
+        return None
+
+    datas = pd.to_datetime(df['date_purchase'], errors='coerce')
+    if datas.isna().all():
+        return None
+
+    data_inicio = datas.max() - pd.DateOffset(months=15)
+    return [('date_purchase', '>=', data_inicio.strftime('%Y-%m-%d'))]
+
+
+def medir_leitura(caminho_parquet, filtro, repeticoes=3):
+    """
+    Mede a latência (melhor de N) de uma leitura típica do app
+    """
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        pd.read_parquet(caminho_parquet, engine='pyarrow', filters=filtro)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def ajustar_layout_parquet(df, tamanho_amostra=500_000, pesos=None):
+    """
+    Avalia combinações de codec, tamanho de row group e ordenação em uma
+    amostra e retorna a melhor configuração junto com os resultados
+    """
+    pesos = pesos or PESOS_AUTO_AJUSTE
+
+    # Amostra aleatória (na ordem original das linhas) e filtro de data
+    # calculado sobre o DataFrame completo, como no app
+    if len(df) > tamanho_amostra:
+        amostra = df.sample(n=tamanho_amostra, random_state=0).sort_index().reset_index(drop=True)
+    else:
+        amostra = df
+    filtro = filtro_leitura_app(df)
+
+    # Row groups do tamanho da amostra ou maiores geram o mesmo arquivo que
+    # um único row group, então não se distinguem no teste
+    row_groups = [rg for rg in TAMANHOS_ROW_GROUP_CANDIDATOS if rg < len(amostra)]
+    descartados = [rg for rg in TAMANHOS_ROW_GROUP_CANDIDATOS if rg >= len(amostra)]
+    if descartados:
+        print(f"ℹ️ Row groups não testados (>= amostra de {len(amostra):,} linhas): "
+              f"{', '.join(f'{rg:,}' for rg in descartados)}")
+    if not row_groups:
+        row_groups = [None]
+
+    ordenacoes = [
+        ordem for ordem in ORDENACOES_CANDIDATAS
+        if ordem is None or all(col in amostra.columns for col in ordem)
+    ]
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as pasta_temp:
+        caminho_teste = os.path.join(pasta_temp, 'amostra.parquet')
+
+        for codec, nivel in CODECS_CANDIDATOS:
+            for row_group in row_groups:
+                for ordem in ordenacoes:
+                    config = {
+                        'compression': codec,
+                        'compression_level': nivel,
+                        'row_group_size': row_group,
+                        'ordenacao': ordem,
+                    }
+                    try:
+                        inicio = time.perf_counter()
+                        escrever_parquet(amostra, caminho_teste, config)
+                        tempo_escrita = time.perf_counter() - inicio
+
+                        resultados.append({
+                            'config': config,
+                            'tamanho_mb': os.path.getsize(caminho_teste) / (1024 * 1024),
+                            'tempo_escrita': tempo_escrita,
+                            'linhas_por_segundo': len(amostra) / tempo_escrita if tempo_escrita > 0 else float('inf'),
+                            'tempo_leitura': medir_leitura(caminho_teste, filtro),
+                        })
+                    except Exception as e:
+                        print(f"⚠️ Configuração ignorada ({descrever_configuracao(config)}): {e}")
+
+    if not resultados:
+        return CONFIGURACAO_PADRAO, []
+
+    menor_tamanho = min(r['tamanho_mb'] for r in resultados) or 1e-9
+    menor_leitura = min(r['tempo_leitura'] for r in resultados) or 1e-9
+    menor_escrita = min(r['tempo_escrita'] for r in resultados) or 1e-9
+
+    for r in resultados:
+        r['score'] = (
+            pesos['tamanho'] * r['tamanho_mb'] / menor_tamanho
+            + pesos['leitura'] * r['tempo_leitura'] / menor_leitura
+            + pesos['escrita'] * r['tempo_escrita'] / menor_escrita
+        )
+
+    resultados.sort(key=lambda r: r['score'])
+    return resultados[0]['config'], resultados
+
+
+def converter_csv_para_parquet(caminho_csv, caminho_parquet=None, auto_ajuste=False,
+                               tamanho_amostra=500_000):
     """
     Converte um arquivo CSV grande para formato Parquet
+
+    Com auto_ajuste=True, codec, row group e ordenação são escolhidos
+    a partir de testes em uma amostra (ver ajustar_layout_parquet)
     """
     print(f"Iniciando conversão: {datetime.now()}")
 
@@ -17,28 +201,23 @@ def converter_csv_para_parquet(caminho_csv, caminho_parquet=None):
     tamanho_original = os.path.getsize(caminho_csv) / (1024 * 1024)  # MB
     print(f"Tamanho original do CSV: {tamanho_original:.2f} MB")
 
-    # 2. Ler apenas as colunas necessárias para análise
-    colunas_essenciais = [
-        'gmv_success',
-        'date_purchase',
-        'time_purchase',
-        'place_destination_departure',
-        'place_origin_return',
-        'fk_contact'
-    ]
-
     try:
-        # 3. Ler o CSV em partes (chunks) se for muito grande
+        # 2. Ler apenas as colunas necessárias para análise
         print("Lendo arquivo CSV...")
-        df = pd.read_csv(caminho_csv, usecols=colunas_essenciais)
+        df = pd.read_csv(caminho_csv, usecols=COLUNAS_ESSENCIAIS)
+
+        # 3. Escolher o layout do Parquet
+        config = CONFIGURACAO_PADRAO  # snappy: boa relação entre compressão e velocidade
+        resultados = []
+        if auto_ajuste:
+            print(f"Auto-ajuste: testando layouts em amostra de até {tamanho_amostra:,} linhas...")
+            config, resultados = ajustar_layout_parquet(df, tamanho_amostra)
 
         # 4. Converter para Parquet
         print("Convertendo para Parquet...")
-        df.to_parquet(
-            caminho_parquet,
-            compression='snappy',  # Boa relação entre compressão e velocidade
-            engine='pyarrow'
-        )
+        inicio = time.perf_counter()
+        escrever_parquet(df, caminho_parquet, config)
+        tempo_escrita = time.perf_counter() - inicio
 
         # 5. Verificar tamanho final
         tamanho_final = os.path.getsize(caminho_parquet) / (1024 * 1024)  # MB
@@ -48,6 +227,17 @@ def converter_csv_para_parquet(caminho_csv, caminho_parquet=None):
         print(f"📊 Tamanho original: {tamanho_original:.2f} MB")
         print(f"📊 Tamanho Parquet: {tamanho_final:.2f} MB")
         print(f"📉 Redução: {reducao:.1f}%")
+        print(f"⚙️ Layout: {descrever_configuracao(config)}")
+        print(f"⏱️ Escrita: {tempo_escrita:.2f} s")
+
+        if resultados:
+            print("\n🔧 Auto-ajuste (melhores layouts na amostra):")
+            for r in resultados[:5]:
+                print(f"   {descrever_configuracao(r['config'])} -> "
+                      f"{r['tamanho_mb']:.2f} MB | "
+                      f"{r['linhas_por_segundo']:,.0f} linhas/s | "
+                      f"leitura {r['tempo_leitura'] * 1000:.1f} ms | "
+                      f"score {r['score']:.2f}")
 
         return caminho_parquet
 
@@ -77,19 +267,267 @@ def verificar_dados_parquet(caminho_parquet):
         return False
 
 
+NOME_CHECKPOINT = '_checkpoint.json'
+
+
+def ler_arquivo_csv(caminho_csv):
+    """
+    Lê os bytes de um CSV (descompactando .gz) - executado em threads
+    """
+    with open(caminho_csv, 'rb') as f:
+        dados = f.read()
+    if caminho_csv.endswith('.gz'):
+        dados = gzip.decompress(dados)
+    return dados
+
+
+def processar_csv(dados, caminho_parquet, config):
+    """
+    Faz o parsing do CSV e grava o Parquet - executado em processos
+    """
+    inicio = time.perf_counter()
+    df = pd.read_csv(io.BytesIO(dados), usecols=COLUNAS_ESSENCIAIS)
+    escrever_parquet(df, caminho_parquet, config)
+    return len(df), time.perf_counter() - inicio
+
+
+def assinatura_arquivo(caminho_csv):
+    """
+    Identifica a versão de um arquivo pelo tamanho e data de modificação
+    """
+    info = os.stat(caminho_csv)
+    return {'tamanho': info.st_size, 'modificado': info.st_mtime}
+
+
+def carregar_checkpoint(caminho_checkpoint):
+    """
+    Carrega o checkpoint de uma execução anterior: arquivos já convertidos
+    (com assinatura, Parquet gerado e layout usado) e o layout do auto-ajuste
+    """
+    checkpoint = {'arquivos': {}, 'layout_auto_ajuste': None}
+    if not os.path.exists(caminho_checkpoint):
+        return checkpoint
+    try:
+        with open(caminho_checkpoint, encoding='utf-8') as f:
+            checkpoint.update(json.load(f))
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ Checkpoint ignorado ({e}), recomeçando do zero")
+    return checkpoint
+
+
+def salvar_checkpoint(caminho_checkpoint, checkpoint):
+    """
+    Grava o checkpoint de forma atômica para sobreviver a interrupções
+    """
+    caminho_temp = caminho_checkpoint + '.tmp'
+    with open(caminho_temp, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(caminho_temp, caminho_checkpoint)
+
+
+def nome_saida_parquet(caminho_csv):
+    """
+    Gera um nome de Parquet único e estável para o CSV de origem: pasta e
+    nome do arquivo para leitura humana, mais um hash curto do caminho absoluto
+    """
+    caminho_csv = os.path.abspath(caminho_csv)
+    pasta = os.path.basename(os.path.dirname(caminho_csv))
+    nome = os.path.basename(caminho_csv)
+    if nome.endswith('.csv.gz'):
+        nome = nome[:-len('.csv.gz')] + '_gz'
+    elif nome.endswith('.csv'):
+        nome = nome[:-len('.csv')]
+    codigo = hashlib.sha1(caminho_csv.encode('utf-8')).hexdigest()[:8]
+    return f"{pasta}__{nome}_{codigo}.parquet"
+
+
+def converter_varios_csv_para_parquet(padroes, pasta_saida, auto_ajuste=False,
+                                      max_threads=4, max_processos=None):
+    """
+    Converte vários CSVs (opcionalmente .csv.gz) encontrados por glob em
+    arquivos Parquet dentro de pasta_saida
+
+    Leitura/descompressão rodam em threads e o parsing em processos.
+    Cada arquivo concluído é registrado imediatamente em um checkpoint,
+    então uma execução interrompida continua de onde parou.
+    """
+    print(f"Iniciando conversão em lote: {datetime.now()}")
+
+    arquivos = sorted({
+        os.path.abspath(caminho)
+        for padrao in padroes
+        for caminho in glob.glob(padrao, recursive=True)
+        if caminho.endswith(('.csv', '.csv.gz'))
+    })
+    if not arquivos:
+        print(f"❌ Nenhum arquivo CSV encontrado para: {', '.join(padroes)}")
+        return []
+
+    os.makedirs(pasta_saida, exist_ok=True)
+    caminho_checkpoint = os.path.join(pasta_saida, NOME_CHECKPOINT)
+    checkpoint = carregar_checkpoint(caminho_checkpoint)
+    concluidos = checkpoint['arquivos']
+
+    config = CONFIGURACAO_PADRAO
+    if auto_ajuste:
+        if checkpoint['layout_auto_ajuste']:
+            # Reutiliza o layout escolhido antes para não reconverter tudo
+            # por causa de variações de medição
+            config = checkpoint['layout_auto_ajuste']
+            print("Auto-ajuste: reutilizando o layout escolhido na execução anterior")
+        else:
+            primeiro_csv = arquivos[0]
+            print(f"Auto-ajuste: testando layouts com {os.path.basename(primeiro_csv)}...")
+            # Arquivo inteiro: a amostra aleatória é feita em ajustar_layout_parquet
+            df_ajuste = pd.read_csv(primeiro_csv, usecols=COLUNAS_ESSENCIAIS)
+            config, _ = ajustar_layout_parquet(df_ajuste)
+            del df_ajuste
+            checkpoint['layout_auto_ajuste'] = config
+            salvar_checkpoint(caminho_checkpoint, checkpoint)
+    print(f"⚙️ Layout: {descrever_configuracao(config)}")
+
+    # Arquivos já registrados mantêm o Parquet do checkpoint
+    saidas = {
+        caminho_csv: (concluidos[caminho_csv]['parquet'] if caminho_csv in concluidos
+                      else os.path.join(pasta_saida, nome_saida_parquet(caminho_csv)))
+        for caminho_csv in arquivos
+    }
+
+    # Dois CSVs gravando o mesmo Parquet corromperiam o arquivo: aborta antes de começar
+    origens = {}
+    for caminho_csv, caminho_parquet in saidas.items():
+        origens.setdefault(os.path.abspath(caminho_parquet), []).append(caminho_csv)
+    colisoes = {parquet: csvs for parquet, csvs in origens.items() if len(csvs) > 1}
+    if colisoes:
+        print("❌ Arquivos de origem diferentes gerariam o mesmo Parquet:")
+        for parquet, csvs in colisoes.items():
+            print(f"   {parquet} <- {', '.join(csvs)}")
+        return []
+
+    pendentes = []
+    for caminho_csv in arquivos:
+        registro = concluidos.get(caminho_csv)
+        if (registro and registro['assinatura'] == assinatura_arquivo(caminho_csv)
+                and registro.get('config') == config
+                and os.path.exists(registro['parquet'])):
+            continue
+        pendentes.append((caminho_csv, saidas[caminho_csv]))
+
+    print(f"📂 Arquivos encontrados: {len(arquivos)} | "
+          f"já convertidos: {len(arquivos) - len(pendentes)} | pendentes: {len(pendentes)}")
+    if not pendentes:
+        return [concluidos[a]['parquet'] for a in arquivos]
+
+    max_processos = max_processos or os.cpu_count() or 1
+    # Limita quantos arquivos descompactados ficam em memória aguardando parsing
+    em_memoria = threading.BoundedSemaphore(max_processos * 2)
+    erros = []
+    finalizados = 0
+    inicio_lote = time.perf_counter()
+
+    def ler_com_limite(caminho_csv):
+        em_memoria.acquire()
+        try:
+            inicio = time.perf_counter()
+            dados = ler_arquivo_csv(caminho_csv)
+            return dados, time.perf_counter() - inicio
+        except BaseException:
+            em_memoria.release()
+            raise
+
+    with ThreadPoolExecutor(max_workers=max_threads) as leitores, \
+            ProcessPoolExecutor(max_workers=max_processos) as processadores:
+        leituras = {
+            leitores.submit(ler_com_limite, caminho_csv): (caminho_csv, caminho_parquet)
+            for caminho_csv, caminho_parquet in pendentes
+        }
+        conversoes = {}
+        ativos = set(leituras)
+
+        # Um único laço trata leituras e conversões à medida que terminam,
+        # gravando o checkpoint assim que cada arquivo é concluído
+        while ativos:
+            prontos, ativos = wait(ativos, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                if futuro in leituras:
+                    caminho_csv, caminho_parquet = leituras.pop(futuro)
+                    try:
+                        dados, tempo_leitura = futuro.result()
+                    except Exception as e:
+                        erros.append(caminho_csv)
+                        finalizados += 1
+                        print(f"❌ [{finalizados}/{len(pendentes)}] Erro ao ler {caminho_csv}: {e}")
+                        continue
+                    conversao = processadores.submit(processar_csv, dados, caminho_parquet, config)
+                    conversao.add_done_callback(lambda _: em_memoria.release())
+                    conversoes[conversao] = (caminho_csv, caminho_parquet, tempo_leitura)
+                    ativos.add(conversao)
+                    del dados
+                    continue
+
+                caminho_csv, caminho_parquet, tempo_leitura = conversoes.pop(futuro)
+                finalizados += 1
+                try:
+                    linhas, tempo_conversao = futuro.result()
+                except Exception as e:
+                    erros.append(caminho_csv)
+                    print(f"❌ [{finalizados}/{len(pendentes)}] Erro em {os.path.basename(caminho_csv)}: {e}")
+                    continue
+
+                concluidos[caminho_csv] = {
+                    'parquet': caminho_parquet,
+                    'linhas': linhas,
+                    'assinatura': assinatura_arquivo(caminho_csv),
+                    'config': config,
+                }
+                salvar_checkpoint(caminho_checkpoint, checkpoint)
+                print(f"✅ [{finalizados}/{len(pendentes)}] {os.path.basename(caminho_csv)}: "
+                      f"{linhas:,} linhas (leitura {tempo_leitura:.1f} s | "
+                      f"conversão {tempo_conversao:.1f} s)")
+
+    print(f"\n✅ Lote concluído em {time.perf_counter() - inicio_lote:.1f} s: {datetime.now()}")
+    print(f"📊 Convertidos: {len(pendentes) - len(erros)} | Com erro: {len(erros)}")
+    if erros:
+        print("💡 Execute novamente para tentar os arquivos com erro; os concluídos serão pulados")
+
+    return [concluidos[a]['parquet'] for a in arquivos if a in concluidos]
+
+
 # Executar a conversão
 if __name__ == "__main__":
-    # Substitua pelo caminho do seu arquivo
-    arquivo_csv = "df_t.csv"
-    arquivo_parquet = "dados_viagens.parquet"
-
-    if os.path.exists(arquivo_csv):
-        # Converter
-        parquet_path = converter_csv_para_parquet(arquivo_csv, arquivo_parquet)
+    parser = argparse.ArgumentParser(description="Converte CSVs de viagens para Parquet")
+    parser.add_argument('arquivos', nargs='*',
+                        help="Arquivos ou padrões glob (ex.: 'dados/**/*.csv.gz'); "
+                             "sem argumentos converte df_t.csv")
+    parser.add_argument('--saida', default='dados_viagens',
+                        help="Pasta de saída no modo com vários arquivos")
+    parser.add_argument('--auto-ajuste', action='store_true',
+                        help="Escolhe codec, row group e ordenação testando em uma amostra")
+    parser.add_argument('--threads', type=int, default=4,
+                        help="Threads de leitura/descompressão")
+    parser.add_argument('--processos', type=int, default=None,
+                        help="Processos de parsing (padrão: núcleos da CPU)")
+    args = parser.parse_args()
 
-        if parquet_path:
-            # Verificar
-            verificar_dados_parquet(parquet_path)
+    if args.arquivos:
+        converter_varios_csv_para_parquet(
+            args.arquivos, args.saida, auto_ajuste=args.auto_ajuste,
+            max_threads=args.threads, max_processos=args.processos
+        )
     else:
-        print(f"❌ Arquivo {arquivo_csv} não encontrado!")
-        print("💡 Dica: Coloque o arquivo CSV na mesma pasta deste script")
+        # Substitua pelo caminho do seu arquivo
+        arquivo_csv = "df_t.csv"
+        arquivo_parquet = "dados_viagens.parquet"
+
+        if os.path.exists(arquivo_csv):
+            # Converter
+            parquet_path = converter_csv_para_parquet(
+                arquivo_csv, arquivo_parquet, auto_ajuste=args.auto_ajuste
+            )
+
+            if parquet_path:
+                # Verificar
+                verificar_dados_parquet(parquet_path)
+        else:
+            print(f"❌ Arquivo {arquivo_csv} não encontrado!")
+            print("💡 Dica: Coloque o arquivo CSV na mesma pasta deste script")